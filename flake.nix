@@ -111,10 +111,10 @@
             source .venv/bin/activate
 
             # Install remaining Python dependencies not available in nixpkgs
-            # (mcp, wikipedia-mcp, ollama client, fastapi, uvicorn, httpx)
+            # (mcp, wikipedia-mcp, ollama client, fastapi, uvicorn, msgspec, httpx, orjson, prompt_toolkit)
             if [ -f requirements.txt ]; then
               echo "Installing additional Python dependencies from requirements.txt..."
-              pip install -q mcp wikipedia-mcp ollama fastapi 'uvicorn[standard]' httpx
+              pip install -q mcp wikipedia-mcp ollama fastapi 'uvicorn[standard]' msgspec 'httpx[http2]' orjson prompt_toolkit
             fi
 
             echo "========================================"
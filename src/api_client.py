@@ -1,21 +1,40 @@
 """API client for the RAG server."""
 
+import asyncio
+import hashlib
 import os
-from typing import Dict, List, Optional
+import socket
+import time
+from collections import OrderedDict
+from types import MappingProxyType
+from typing import TYPE_CHECKING, AsyncIterator, Iterator, Mapping, Optional, Tuple, Union
 from dataclasses import dataclass
 
-import httpx
+import orjson
 
+from semantic_cache import SemanticCache
 
-@dataclass
+if TYPE_CHECKING:
+    import httpx
+
+
+# Request bodies are pre-encoded with orjson and sent as raw content
+_JSON_HEADERS = {"Content-Type": "application/json"}
+
+
+@dataclass(slots=True, frozen=True)
 class APIAnswer:
-    """Answer from the API."""
+    """Answer from the API.
+    
+    Cached answers are shared between callers, so sources is a tuple of
+    read-only mappings rather than a list of dicts.
+    """
     answer: str
-    sources: List[Dict[str, str]]
+    sources: Tuple[Mapping[str, Union[int, str]], ...]
     processing_time: float
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class APIHealth:
     """Health status from the API."""
     status: str
@@ -41,10 +60,15 @@ class ServerError(APIClientError):
 class RAGAPIClient:
     """Client for the RAG API server."""
     
+    # Answer cache limits (entries, seconds)
+    _CACHE_MAX = 256
+    _CACHE_TTL = 3600.0
+    
     def __init__(
         self,
         base_url: Optional[str] = None,
-        timeout: float = 120.0
+        timeout: float = 120.0,
+        semantic_cache: Optional[SemanticCache] = None
     ):
         """Initialize the API client.
         
@@ -52,26 +76,273 @@ class RAGAPIClient:
             base_url: Base URL of the API server. If None, uses AISHE_API_URL
                      environment variable or defaults to http://localhost:8000
             timeout: Request timeout in seconds (default: 120s for LLM processing)
+            semantic_cache: Cache used to answer paraphrased questions. If None,
+                     a default SemanticCache is created (inert unless
+                     sentence-transformers is installed)
         """
         if base_url is None:
             base_url = os.getenv("AISHE_API_URL", "http://localhost:8000")
         
         self.base_url = base_url.rstrip("/")
         self.timeout = timeout
-        self.client = httpx.Client(timeout=timeout)
+        self._health_url = f"{self.base_url}/health"
+        self._ask_url = f"{self.base_url}/api/v1/ask"
+        self._ask_stream_url = f"{self.base_url}/api/v1/ask/stream"
+        # httpx is imported here rather than at module level so that
+        # importing this module (and printing the CLI banner) stays fast
+        import httpx
+        self._httpx = httpx
+        
+        # Reuse keep-alive connections across calls; HTTP/2 is negotiated
+        # via ALPN when the server is reached over TLS. Nagle's algorithm is
+        # disabled so small question bodies are sent without delay.
+        transport_options = dict(
+            http2=True,
+            limits=httpx.Limits(
+                max_keepalive_connections=10,
+                max_connections=20,
+                keepalive_expiry=60.0
+            ),
+            socket_options=[(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)]
+        )
+        self.client = httpx.Client(
+            timeout=timeout,
+            transport=httpx.HTTPTransport(**transport_options)
+        )
+        self.aclient = httpx.AsyncClient(
+            timeout=timeout,
+            transport=httpx.AsyncHTTPTransport(**transport_options)
+        )
+        
+        # LRU cache of answers keyed by normalized question hash
+        self._cache: "OrderedDict[str, Tuple[float, APIAnswer]]" = OrderedDict()
+        self._semantic_cache = semantic_cache or SemanticCache()
+        
+        # Cleared when the server turns out to predate the streaming endpoint
+        self._stream_supported = True
     
     def __enter__(self):
         """Context manager entry."""
         return self
     
     def __exit__(self, exc_type, exc_val, exc_tb):
-        """Context manager exit."""
+        """Context manager exit (sync client only, see close())."""
         self.close()
     
+    async def __aenter__(self):
+        """Async context manager entry."""
+        return self
+    
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        """Async context manager exit."""
+        await self.aclose()
+    
     def close(self):
-        """Close the HTTP client."""
+        """Close the sync HTTP client.
+        
+        The async client can only be closed from an event loop: callers that
+        use the a* methods must call aclose() (or use ``async with``), which
+        closes both clients.
+        """
         self.client.close()
     
+    async def aclose(self):
+        """Close both the async and the sync HTTP clients."""
+        await self.aclient.aclose()
+        self.client.close()
+    
+    def _parse_health(self, data: dict) -> APIHealth:
+        """Build an APIHealth from a /health response body."""
+        return APIHealth(
+            status=data["status"],
+            ollama_accessible=data["ollama_accessible"],
+            message=data.get("message")
+        )
+    
+    def _parse_answer(self, data: dict) -> APIAnswer:
+        """Build an APIAnswer from an /api/v1/ask response body.
+        
+        Raises:
+            APIClientError: If the body is missing fields or has the wrong shape
+        """
+        # The server already returns sources as number/title/url dicts;
+        # wrap them read-only instead of copying
+        try:
+            return APIAnswer(
+                answer=data["answer"],
+                sources=tuple(map(MappingProxyType, data["sources"])),
+                processing_time=data["processing_time"]
+            )
+        except (KeyError, TypeError) as e:
+            raise APIClientError(f"Malformed response: {e}") from e
+    
+    def _decode(self, content) -> dict:
+        """Decode a JSON response body or stream frame into a dict.
+        
+        Raises:
+            APIClientError: If the content is not a JSON object
+        """
+        try:
+            data = orjson.loads(content)
+        except ValueError as e:
+            raise APIClientError(f"Malformed response: {e}") from e
+        if not isinstance(data, dict):
+            raise APIClientError(
+                f"Malformed response: expected a JSON object, got {type(data).__name__}"
+            )
+        return data
+    
+    def _cache_key(self, question: str) -> str:
+        """Return the cache key for a question."""
+        return hashlib.sha256(question.strip().lower().encode()).hexdigest()
+    
+    def _cache_get(self, key: str) -> Optional[APIAnswer]:
+        """Return a cached answer if present and not expired."""
+        entry = self._cache.get(key)
+        if entry is None:
+            return None
+        
+        timestamp, answer = entry
+        if time.monotonic() - timestamp >= self._CACHE_TTL:
+            del self._cache[key]
+            return None
+        
+        self._cache.move_to_end(key)
+        return answer
+    
+    def _cache_put(
+        self,
+        key: str,
+        answer: APIAnswer,
+        timestamp: Optional[float] = None
+    ):
+        """Store an answer, evicting the least recently used entry if full.
+        
+        Args:
+            key: Cache key from _cache_key()
+            answer: Answer to cache
+            timestamp: time.monotonic() value the answer was fetched at
+                (defaults to now); the TTL counts from this
+        """
+        if timestamp is None:
+            timestamp = time.monotonic()
+        self._cache[key] = (timestamp, answer)
+        self._cache.move_to_end(key)
+        if len(self._cache) > self._CACHE_MAX:
+            self._cache.popitem(last=False)
+    
+    def _semantic_get(self, key: str, vector) -> Optional[APIAnswer]:
+        """Return an unexpired answer to a similar question.
+        
+        A hit is promoted to the exact cache with its original timestamp, so
+        it still expires when the semantic entry would have.
+        """
+        hit = self._semantic_cache.lookup(vector, max_age=self._CACHE_TTL)
+        if hit is None:
+            return None
+        timestamp, answer = hit
+        self._cache_put(key, answer, timestamp)
+        return answer
+    
+    def _remember(self, key: str, vector, answer: APIAnswer):
+        """Store a fresh answer in both caches."""
+        timestamp = time.monotonic()
+        self._cache_put(key, answer, timestamp)
+        self._semantic_cache.add(vector, answer, timestamp)
+    
+    def _parse_stream_frame(self, line: str) -> dict:
+        """Decode one NDJSON frame from the streaming endpoint.
+        
+        Raises:
+            ServerError: If the server reported an error mid-stream
+            APIClientError: If the frame is not a JSON object
+        """
+        frame = self._decode(line)
+        if "error" in frame:
+            raise ServerError(f"Server error: {frame['error']}")
+        return frame
+    
+    def _health_error(self, e: Exception) -> APIClientError:
+        """Translate an exception raised during a health check."""
+        if isinstance(e, self._httpx.ConnectError):
+            return ServerNotReachableError(
+                f"Cannot connect to server at {self.base_url}. "
+                "Make sure the server is running."
+            )
+        if isinstance(e, self._httpx.TimeoutException):
+            return ServerNotReachableError(
+                f"Request to {self.base_url} timed out."
+            )
+        if isinstance(e, self._httpx.HTTPStatusError):
+            return ServerError(
+                f"Server returned error: {e.response.status_code}"
+            )
+        return APIClientError(f"Unexpected error: {str(e)}")
+    
+    def _parse_error(self, response: "httpx.Response") -> str:
+        """Extract the error detail from an error response body."""
+        try:
+            return orjson.loads(response.content).get("detail") or response.text
+        except Exception:
+            return response.text
+    
+    def _ask_error(self, e: "httpx.HTTPError") -> APIClientError:
+        """Translate an exception raised while asking a question."""
+        if isinstance(e, self._httpx.ConnectError):
+            return ServerNotReachableError(
+                f"Cannot connect to server at {self.base_url}. "
+                "Make sure the server is running with: nix run .#server"
+            )
+        if isinstance(e, self._httpx.TimeoutException):
+            return ServerNotReachableError(
+                f"Request timed out after {self.timeout} seconds. "
+                "The question might be too complex."
+            )
+        if isinstance(e, self._httpx.HTTPStatusError):
+            return ServerError(
+                f"Server error ({e.response.status_code}): "
+                f"{self._parse_error(e.response)}"
+            )
+        return APIClientError(f"Unexpected error: {str(e)}")
+    
+    def _post_ask(self, key: str, vector, question: str) -> APIAnswer:
+        """Fetch an answer from the non-streaming endpoint and cache it.
+        
+        Args:
+            key: Cache key from _cache_key()
+            vector: Question embedding from the semantic cache (or None)
+            question: The question to ask
+        """
+        try:
+            response = self.client.post(
+                self._ask_url,
+                content=orjson.dumps({"question": question.strip()}),
+                headers=_JSON_HEADERS
+            )
+            response.raise_for_status()
+        except self._httpx.HTTPError as e:
+            raise self._ask_error(e) from e
+        
+        answer = self._parse_answer(self._decode(response.content))
+        self._remember(key, vector, answer)
+        return answer
+    
+    async def _apost_ask(self, key: str, vector, question: str) -> APIAnswer:
+        """Async variant of _post_ask()."""
+        try:
+            response = await self.aclient.post(
+                self._ask_url,
+                content=orjson.dumps({"question": question.strip()}),
+                headers=_JSON_HEADERS
+            )
+            response.raise_for_status()
+        except self._httpx.HTTPError as e:
+            raise self._ask_error(e) from e
+        
+        answer = self._parse_answer(self._decode(response.content))
+        self._remember(key, vector, answer)
+        return answer
+    
     def check_health(self) -> APIHealth:
         """Check the health of the API server.
         
@@ -83,30 +354,28 @@ class RAGAPIClient:
             ServerError: If the server returns an error
         """
         try:
-            response = self.client.get(f"{self.base_url}/health")
+            response = self.client.get(self._health_url)
             response.raise_for_status()
-            data = response.json()
+            return self._parse_health(orjson.loads(response.content))
+        except Exception as e:
+            raise self._health_error(e) from e
+    
+    async def acheck_health(self) -> APIHealth:
+        """Check the health of the API server without blocking the event loop.
+        
+        Returns:
+            APIHealth object with server status
             
-            return APIHealth(
-                status=data["status"],
-                ollama_accessible=data["ollama_accessible"],
-                message=data.get("message")
-            )
-        except httpx.ConnectError as e:
-            raise ServerNotReachableError(
-                f"Cannot connect to server at {self.base_url}. "
-                "Make sure the server is running."
-            ) from e
-        except httpx.TimeoutException as e:
-            raise ServerNotReachableError(
-                f"Request to {self.base_url} timed out."
-            ) from e
-        except httpx.HTTPStatusError as e:
-            raise ServerError(
-                f"Server returned error: {e.response.status_code}"
-            ) from e
+        Raises:
+            ServerNotReachableError: If the server is not reachable
+            ServerError: If the server returns an error
+        """
+        try:
+            response = await self.aclient.get(self._health_url)
+            response.raise_for_status()
+            return self._parse_health(orjson.loads(response.content))
         except Exception as e:
-            raise APIClientError(f"Unexpected error: {str(e)}") from e
+            raise self._health_error(e) from e
     
     def ask_question(self, question: str) -> APIAnswer:
         """Ask a question to the RAG system.
@@ -125,52 +394,207 @@ class RAGAPIClient:
         if not question or not question.strip():
             raise ValueError("Question cannot be empty")
         
+        key = self._cache_key(question)
+        cached = self._cache_get(key)
+        if cached is not None:
+            return cached
+        
+        vector = self._semantic_cache.embed(question)
+        cached = self._semantic_get(key, vector)
+        if cached is not None:
+            return cached
+        
+        return self._post_ask(key, vector, question)
+    
+    async def aask_question(self, question: str) -> APIAnswer:
+        """Ask a question to the RAG system without blocking the event loop.
+        
+        Args:
+            question: The question to ask
+            
+        Returns:
+            APIAnswer object with the answer and sources
+            
+        Raises:
+            ServerNotReachableError: If the server is not reachable
+            ServerError: If the server returns an error
+            APIClientError: For other errors
+        """
+        if not question or not question.strip():
+            raise ValueError("Question cannot be empty")
+        
+        key = self._cache_key(question)
+        cached = self._cache_get(key)
+        if cached is not None:
+            return cached
+        
+        vector = await asyncio.to_thread(
+            self._semantic_cache.embed, question)
+        cached = self._semantic_get(key, vector)
+        if cached is not None:
+            return cached
+        
+        return await self._apost_ask(key, vector, question)
+    
+    def ask_question_stream(
+        self,
+        question: str
+    ) -> Iterator[Union[str, APIAnswer]]:
+        """Ask a question and stream the answer as it is generated.
+        
+        Falls back to the non-streaming endpoint on servers without
+        streaming support.
+        
+        Args:
+            question: The question to ask
+            
+        Yields:
+            Chunks of answer text as they arrive, followed by the complete
+            APIAnswer (including sources) as the last item
+            
+        Raises:
+            ServerNotReachableError: If the server is not reachable
+            ServerError: If the server returns an error
+            APIClientError: For other errors
+        """
+        if not question or not question.strip():
+            raise ValueError("Question cannot be empty")
+        
+        key = self._cache_key(question)
+        cached = self._cache_get(key)
+        if cached is None:
+            vector = self._semantic_cache.embed(question)
+            cached = self._semantic_get(key, vector)
+        if cached is not None:
+            yield cached.answer
+            yield cached
+            return
+        
+        data = None
         try:
-            response = self.client.post(
-                f"{self.base_url}/api/v1/ask",
-                json={"question": question.strip()}
+            if self._stream_supported:
+                with self.client.stream(
+                    "POST",
+                    self._ask_stream_url,
+                    content=orjson.dumps({"question": question.strip()}),
+                    headers=_JSON_HEADERS
+                ) as response:
+                    if response.status_code == 404:
+                        # Server predates the streaming endpoint: drain the
+                        # body so the connection returns to the pool, and
+                        # stop trying the endpoint
+                        response.read()
+                        self._stream_supported = False
+                    else:
+                        if response.is_error:
+                            response.read()
+                        response.raise_for_status()
+                        
+                        chunks = []
+                        for line in response.iter_lines():
+                            if not line:
+                                continue
+                            frame = self._parse_stream_frame(line)
+                            if "token" in frame:
+                                chunks.append(frame["token"])
+                                yield frame["token"]
+                            else:
+                                data = dict(frame, answer="".join(chunks))
+        except self._httpx.HTTPError as e:
+            raise self._ask_error(e) from e
+        
+        if not self._stream_supported:
+            answer = self._post_ask(key, vector, question)
+            yield answer.answer
+            yield answer
+            return
+        
+        if data is None:
+            raise APIClientError(
+                "Stream ended before the answer was complete"
             )
-            response.raise_for_status()
-            data = response.json()
+        answer = self._parse_answer(data)
+        self._remember(key, vector, answer)
+        yield answer
+    
+    async def aask_question_stream(
+        self,
+        question: str
+    ) -> AsyncIterator[Union[str, APIAnswer]]:
+        """Ask a question and stream the answer without blocking the event loop.
+        
+        Falls back to the non-streaming endpoint on servers without
+        streaming support.
+        
+        Args:
+            question: The question to ask
             
-            # Convert sources to dict format
-            sources = [
-                {
-                    "number": source["number"],
-                    "title": source["title"],
-                    "url": source["url"]
-                }
-                for source in data["sources"]
-            ]
+        Yields:
+            Chunks of answer text as they arrive, followed by the complete
+            APIAnswer (including sources) as the last item
             
-            return APIAnswer(
-                answer=data["answer"],
-                sources=sources,
-                processing_time=data["processing_time"]
+        Raises:
+            ServerNotReachableError: If the server is not reachable
+            ServerError: If the server returns an error
+            APIClientError: For other errors
+        """
+        if not question or not question.strip():
+            raise ValueError("Question cannot be empty")
+        
+        key = self._cache_key(question)
+        cached = self._cache_get(key)
+        if cached is None:
+            vector = await asyncio.to_thread(
+                self._semantic_cache.embed, question)
+            cached = self._semantic_get(key, vector)
+        if cached is not None:
+            yield cached.answer
+            yield cached
+            return
+        
+        data = None
+        try:
+            if self._stream_supported:
+                async with self.aclient.stream(
+                    "POST",
+                    self._ask_stream_url,
+                    content=orjson.dumps({"question": question.strip()}),
+                    headers=_JSON_HEADERS
+                ) as response:
+                    if response.status_code == 404:
+                        # Server predates the streaming endpoint: drain the
+                        # body so the connection returns to the pool, and
+                        # stop trying the endpoint
+                        await response.aread()
+                        self._stream_supported = False
+                    else:
+                        if response.is_error:
+                            await response.aread()
+                        response.raise_for_status()
+                        
+                        chunks = []
+                        async for line in response.aiter_lines():
+                            if not line:
+                                continue
+                            frame = self._parse_stream_frame(line)
+                            if "token" in frame:
+                                chunks.append(frame["token"])
+                                yield frame["token"]
+                            else:
+                                data = dict(frame, answer="".join(chunks))
+        except self._httpx.HTTPError as e:
+            raise self._ask_error(e) from e
+        
+        if not self._stream_supported:
+            answer = await self._apost_ask(key, vector, question)
+            yield answer.answer
+            yield answer
+            return
+        
+        if data is None:
+            raise APIClientError(
+                "Stream ended before the answer was complete"
             )
-        except httpx.ConnectError as e:
-            raise ServerNotReachableError(
-                f"Cannot connect to server at {self.base_url}. "
-                "Make sure the server is running with: nix run .#server"
-            ) from e
-        except httpx.TimeoutException as e:
-            raise ServerNotReachableError(
-                f"Request timed out after {self.timeout} seconds. "
-                "The question might be too complex."
-            ) from e
-        except httpx.HTTPStatusError as e:
-            error_detail = "Unknown error"
-            try:
-                error_data = e.response.json()
-                error_detail = error_data.get("detail", str(error_data))
-            except:
-                error_detail = e.response.text
-            
-            raise ServerError(
-                f"Server error ({e.response.status_code}): {error_detail}"
-            ) from e
-        except ValueError as e:
-            raise e
-        except Exception as e:
-            raise APIClientError(f"Unexpected error: {str(e)}") from e
-
+        answer = self._parse_answer(data)
+        self._remember(key, vector, answer)
+        yield answer
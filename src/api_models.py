@@ -1,83 +1,108 @@
-"""API models for the RAG server."""
+"""API models for the RAG server.
 
-from typing import List, Optional
-from pydantic import BaseModel, Field
+Models are immutable and never form reference cycles, so they are frozen and
+left untracked by the garbage collector. Constraints and docs live in
+msgspec.Meta, which is compiled once per type rather than run per request.
+msgspec only checks constraints when decoding, so on the response models the
+server constructs itself (e.g. ``ge=1`` on Source.number) they document the
+OpenAPI schema but are not enforced.
+"""
 
+from typing import Annotated, Any, Dict, List, Optional
 
-class QuestionRequest(BaseModel):
+import msgspec
+
+
+class QuestionRequest(msgspec.Struct, frozen=True, gc=False):
     """Request model for asking a question."""
-    
-    question: str = Field(
-        ...,
+
+    question: Annotated[str, msgspec.Meta(
         min_length=1,
         description="The question to answer",
         examples=["What is the capital of France?"]
-    )
+    )]
 
 
-class Source(BaseModel):
+class Source(msgspec.Struct, frozen=True, gc=False):
     """Model for a source reference."""
-    
-    number: int = Field(
-        ...,
-        description="Source reference number",
-        ge=1
-    )
-    title: str = Field(
-        ...,
+
+    number: Annotated[int, msgspec.Meta(
+        ge=1,
+        description="Source reference number"
+    )]
+    title: Annotated[str, msgspec.Meta(
         description="Title of the source article"
-    )
-    url: str = Field(
-        ...,
+    )]
+    url: Annotated[str, msgspec.Meta(
         description="URL of the source article"
-    )
+    )]
 
 
-class AnswerResponse(BaseModel):
+class AnswerResponse(msgspec.Struct, frozen=True, gc=False):
     """Response model for an answer."""
-    
-    answer: str = Field(
-        ...,
+
+    answer: Annotated[str, msgspec.Meta(
         description="The generated answer to the question"
-    )
-    sources: List[Source] = Field(
-        default_factory=list,
+    )]
+    processing_time: Annotated[float, msgspec.Meta(
+        ge=0,
+        description="Time taken to process the question in seconds"
+    )]
+    sources: Annotated[List[Source], msgspec.Meta(
         description="List of sources used to generate the answer"
-    )
-    processing_time: float = Field(
-        ...,
-        description="Time taken to process the question in seconds",
-        ge=0
-    )
+    )] = []
 
 
-class HealthResponse(BaseModel):
+class HealthResponse(msgspec.Struct, frozen=True, gc=False):
     """Response model for health check."""
-    
-    status: str = Field(
-        ...,
+
+    status: Annotated[str, msgspec.Meta(
         description="Server status",
         examples=["healthy"]
-    )
-    ollama_accessible: bool = Field(
-        ...,
+    )]
+    ollama_accessible: Annotated[bool, msgspec.Meta(
         description="Whether Ollama service is accessible"
-    )
-    message: Optional[str] = Field(
-        None,
+    )]
+    message: Annotated[Optional[str], msgspec.Meta(
         description="Additional status message"
-    )
+    )] = None
 
 
-class ErrorResponse(BaseModel):
+class ErrorResponse(msgspec.Struct, frozen=True, gc=False):
     """Response model for errors."""
-    
-    error: str = Field(
-        ...,
+
+    error: Annotated[str, msgspec.Meta(
         description="Error message"
-    )
-    detail: Optional[str] = Field(
-        None,
+    )]
+    detail: Annotated[Optional[str], msgspec.Meta(
         description="Detailed error information"
+    )] = None
+
+
+API_MODELS = (QuestionRequest, AnswerResponse, HealthResponse, ErrorResponse)
+
+
+def openapi_schemas() -> Dict[str, Any]:
+    """Build OpenAPI component schemas for the API models.
+
+    Returns:
+        Mapping of model name to JSON schema, referencing each other
+        under #/components/schemas
+    """
+    _, components = msgspec.json.schema_components(
+        API_MODELS,
+        ref_template="#/components/schemas/{name}"
     )
+    return components
+
+
+def schema_ref(model: type) -> Dict[str, str]:
+    """Return an OpenAPI reference to a model's component schema.
+
+    Args:
+        model: One of the API model classes
 
+    Returns:
+        JSON reference object
+    """
+    return {"$ref": f"#/components/schemas/{model.__name__}"}
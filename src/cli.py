@@ -1,9 +1,46 @@
 """Command-line interface for the RAG system."""
 
+import asyncio
+import re
+import signal
 import sys
+from contextlib import aclosing
 from pathlib import Path
 
-from api_client import RAGAPIClient, ServerNotReachableError, ServerError, APIClientError
+import orjson
+
+from api_client import APIAnswer, RAGAPIClient, ServerNotReachableError, ServerError, APIClientError
+
+
+HISTORY_FILE = Path("~/.aishe_history").expanduser()
+DEFAULT_BATCH_CONCURRENCY = 8
+
+_BAR_EQ = "=" * 70
+_BAR_DASH = "─" * 70
+
+_BANNER = (
+    f"{_BAR_EQ}\n"
+    "Wikipedia RAG Question Answering System\n"
+    f"{_BAR_EQ}\n"
+    "Ask questions and get answers based on Wikipedia articles.\n"
+    "Type 'quit' or 'exit' to stop.\n"
+    f"{_BAR_EQ}\n"
+    "\n"
+)
+_ANSWER_HEADER = f"\n{_BAR_DASH}\nANSWER:\n{_BAR_DASH}\n"
+_SOURCES_HEADER = f"\n{_BAR_DASH}\nSOURCES:\n{_BAR_DASH}"
+
+
+def split_questions(text):
+    """Split pasted input into separate questions on blank lines.
+
+    Args:
+        text: Raw text entered at the prompt
+
+    Returns:
+        List of non-empty questions
+    """
+    return [q.strip() for q in re.split(r"\n\s*\n", text) if q.strip()]
 
 
 class RAGCLI:
@@ -15,17 +52,32 @@ class RAGCLI:
         Args:
             api_url: Optional API URL. If None, uses environment variable or default.
         """
-        self.api_client = RAGAPIClient(base_url=api_url)
+        self.api_url = api_url
+        self.api_client = None
+        self.session = None
+
+    def connect(self):
+        """Create the API client.
+
+        Kept out of __init__ (like create_session) so httpx, which is slow
+        to import, is loaded after the banner has been printed.
+        """
+        self.api_client = RAGAPIClient(base_url=self.api_url)
+
+    def create_session(self):
+        """Create the interactive prompt session."""
+        from prompt_toolkit import PromptSession
+        from prompt_toolkit.history import FileHistory
+
+        self.session = PromptSession(history=FileHistory(str(HISTORY_FILE)))
 
     def print_banner(self):
         """Print welcome banner."""
-        print("=" * 70)
-        print("Wikipedia RAG Question Answering System")
-        print("=" * 70)
-        print("Ask questions and get answers based on Wikipedia articles.")
-        print("Type 'quit' or 'exit' to stop.")
-        print("=" * 70)
-        print()
+        sys.stdout.write(_BANNER)
+
+    def print_answer_header(self):
+        """Print the heading shown above an answer."""
+        sys.stdout.write(_ANSWER_HEADER)
 
     def print_result(self, result):
         """Print RAG result in a formatted way.
@@ -33,29 +85,205 @@ class RAGCLI:
         Args:
             result: RAGResult object
         """
-        print("\n" + "─" * 70)
-        print("ANSWER:")
-        print("─" * 70)
-        print(result.answer)
+        sys.stdout.write(
+            f"{_ANSWER_HEADER}{result.answer}\n{self.format_sources(result)}"
+        )
+
+    def print_sources(self, result):
+        """Print the sources of a RAG result and the closing separator.
+
+        Args:
+            result: RAGResult object
+        """
+        sys.stdout.write(self.format_sources(result))
+
+    def format_sources(self, result):
+        """Format the sources of a RAG result and the closing separator.
+
+        Args:
+            result: RAGResult object
 
+        Returns:
+            Text to print after the answer
+        """
+        lines = []
         if result.sources:
-            print("\n" + "─" * 70)
-            print("SOURCES:")
-            print("─" * 70)
+            lines.append(_SOURCES_HEADER)
             for source in result.sources:
-                print(f"[{source['number']}] {source['title']}")
-                print(f"    {source['url']}")
+                lines.append(f"[{source['number']}] {source['title']}")
+                lines.append(f"    {source['url']}")
+
+        lines.append(_BAR_DASH)
+        return "\n".join(lines) + "\n"
+
+    async def stream_question(self, question):
+        """Ask a single question, printing the answer as it is generated.
+
+        Args:
+            question: The question to ask
+        """
+        result = None
+        started = False
+        # aclosing() closes the HTTP stream promptly if we are cancelled
+        stream = self.api_client.aask_question_stream(question)
+        async with aclosing(stream):
+            async for item in stream:
+                if isinstance(item, APIAnswer):
+                    result = item
+                    continue
+                # Hold the header back until the first chunk so errors raised
+                # before generation starts are not printed under it
+                if not started:
+                    self.print_answer_header()
+                    started = True
+                print(item, end="", flush=True)
+
+        print()
+        self.print_sources(result)
+
+    async def run_cancellable(self, coro):
+        """Run a request so that Ctrl-C cancels it instead of exiting the CLI.
+
+        Only the in-flight request is cancelled; the API client and its
+        keep-alive pool stay open for the next question. The connection the
+        interrupted request was using is dropped, though: an HTTP/1.1
+        response cannot be abandoned mid-body, so the next question opens a
+        new connection. Only HTTP/2 (negotiated over TLS) resets just the
+        stream and keeps the connection.
+
+        Args:
+            coro: Coroutine performing the request
 
-        print("─" * 70)
+        Returns:
+            True if the request completed, False if the user cancelled it
+        """
+        loop = asyncio.get_running_loop()
+        task = asyncio.ensure_future(coro)
+        previous = signal.getsignal(signal.SIGINT)
+        try:
+            loop.add_signal_handler(signal.SIGINT, task.cancel)
+        except (NotImplementedError, RuntimeError):
+            # No loop signal handlers (e.g. Windows); Ctrl-C exits as before
+            await task
+            return True
+
+        try:
+            await task
+            return True
+        except asyncio.CancelledError:
+            # Propagate if we are being cancelled ourselves
+            if asyncio.current_task().cancelling():
+                raise
+            return False
+        finally:
+            loop.remove_signal_handler(signal.SIGINT)
+            if previous is not None:
+                signal.signal(signal.SIGINT, previous)
+
+    async def ask_questions(self, questions):
+        """Ask several questions concurrently and print each result.
+
+        Args:
+            questions: List of questions to ask
+        """
+        if len(questions) == 1:
+            await self.stream_question(questions[0])
+            return
+
+        # One failed question must not discard the other answers
+        results = await asyncio.gather(
+            *(self.api_client.aask_question(q) for q in questions),
+            return_exceptions=True
+        )
+        for question, result in zip(questions, results):
+            print(f"\nQUESTION: {question}")
+            if isinstance(result, ServerError):
+                print(f"\n❌ Server Error: {result}")
+            elif isinstance(result, Exception):
+                print(f"\n❌ Error: {result}")
+            else:
+                self.print_result(result)
 
     def run(self):
         """Run the interactive CLI."""
+        try:
+            asyncio.run(self.run_async())
+        except KeyboardInterrupt:
+            print("\n\nGoodbye!")
+
+    async def run_async(self):
+        """Run the interactive CLI on the asyncio event loop."""
         self.print_banner()
+        self.connect()
+        health_task = asyncio.create_task(self.api_client.acheck_health())
+        # Importing prompt_toolkit is slow; doing it off the event loop lets
+        # the health check resolve DNS and open the connection meanwhile, so
+        # the first question finds it warm in the keep-alive pool
+        await asyncio.to_thread(self.create_session)
+
+        try:
+            await self._interact(health_task)
+        finally:
+            await self.api_client.aclose()
+
+    def run_batch(self, questions, concurrency=DEFAULT_BATCH_CONCURRENCY):
+        """Answer questions non-interactively, printing one JSON line each.
+
+        Args:
+            questions: List of questions to ask
+            concurrency: Maximum number of requests in flight
+
+        Returns:
+            True if every question was answered, False if any failed
+        """
+        return asyncio.run(self.run_batch_async(questions, concurrency))
+
+    async def run_batch_async(self, questions, concurrency=DEFAULT_BATCH_CONCURRENCY):
+        """Answer questions concurrently, printing results in input order.
+
+        Args:
+            questions: List of questions to ask
+            concurrency: Maximum number of requests in flight
+
+        Returns:
+            True if every question was answered, False if any failed
+        """
+        self.connect()
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def run_one(question):
+            async with semaphore:
+                try:
+                    result = await self.api_client.aask_question(question)
+                except Exception as e:
+                    return {"question": question, "error": str(e)}
+            return {
+                "question": question,
+                "answer": result.answer,
+                "sources": list(map(dict, result.sources)),
+                "processing_time": result.processing_time
+            }
+
+        try:
+            results = await asyncio.gather(*(run_one(q) for q in questions))
+        finally:
+            await self.api_client.aclose()
+
+        for record in results:
+            sys.stdout.write(orjson.dumps(record).decode() + "\n")
 
+        return not any("error" in record for record in results)
+
+    async def _interact(self, health_task):
+        """Report server health, then answer questions until the user quits.
+
+        Args:
+            health_task: Pending health check task started by run_async
+        """
         # Check server health on startup
         try:
             print("Checking server connection...")
-            health = self.api_client.check_health()
+            health = await health_task
             if health.status == "healthy":
                 print("✓ Connected to server")
             else:
@@ -76,7 +304,7 @@ class RAGCLI:
         while True:
             try:
                 # Get user input
-                question = input("\nYour question: ").strip()
+                question = (await self.session.prompt_async("\nYour question: ")).strip()
 
                 # Check for exit commands
                 if question.lower() in ['quit', 'exit', 'q']:
@@ -87,14 +315,15 @@ class RAGCLI:
                 if not question:
                     continue
 
-                # Process question
+                # Process question(s)
                 print("\nSearching Wikipedia and generating answer...")
-                result = self.api_client.ask_question(question)
+                completed = await self.run_cancellable(
+                    self.ask_questions(split_questions(question))
+                )
+                if not completed:
+                    print("\n\nCancelled.")
 
-                # Display result
-                self.print_result(result)
-
-            except KeyboardInterrupt:
+            except (KeyboardInterrupt, EOFError):
                 print("\n\nGoodbye!")
                 break
             except ServerNotReachableError as e:
@@ -113,8 +342,31 @@ class RAGCLI:
 
 def main():
     """Entry point for the CLI."""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="AISHE question answering CLI")
+    parser.add_argument(
+        "--batch",
+        action="store_true",
+        help="Read newline-delimited questions from stdin and print JSON lines"
+    )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=DEFAULT_BATCH_CONCURRENCY,
+        help=f"Maximum concurrent requests in batch mode (default: {DEFAULT_BATCH_CONCURRENCY})"
+    )
+    args = parser.parse_args()
+
     cli = RAGCLI()
-    cli.run()
+    if args.batch:
+        if args.concurrency < 1:
+            parser.error("--concurrency must be at least 1")
+        questions = [q.strip() for q in sys.stdin.read().splitlines() if q.strip()]
+        if not cli.run_batch(questions, concurrency=args.concurrency):
+            sys.exit(1)
+    else:
+        cli.run()
 
 
 if __name__ == "__main__":
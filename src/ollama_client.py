@@ -1,6 +1,6 @@
 """Ollama client for LLM interactions."""
 
-from typing import AsyncIterator, Dict, List, Optional
+from typing import AsyncIterator, Dict, Iterator, List, Optional
 import ollama
 
 
@@ -132,19 +132,17 @@ Answer based on the context provided above:"""
 
         return self.generate(full_prompt, model=model, **kwargs)
 
-    def chat_with_context(self, question: str, context: str, model: Optional[str] = None, **kwargs) -> str:
-        """Chat with the LLM using context (RAG pattern).
+    def _context_messages(self, question: str, context: str) -> List[Dict[str, str]]:
+        """Build the chat messages for a RAG question.
 
         Args:
             question: The user's question
             context: Retrieved context to answer the question
-            model: Model to use (defaults to self.model)
-            **kwargs: Additional parameters for chat
 
         Returns:
-            Generated response text
+            List of message dictionaries with 'role' and 'content'
         """
-        messages = [
+        return [
             {
                 "role": "system",
                 "content": "You are a helpful assistant. Answer questions based on the provided context. If the context doesn't contain enough information, say so."
@@ -155,4 +153,32 @@ Answer based on the context provided above:"""
             }
         ]
 
+    def chat_with_context(self, question: str, context: str, model: Optional[str] = None, **kwargs) -> str:
+        """Chat with the LLM using context (RAG pattern).
+
+        Args:
+            question: The user's question
+            context: Retrieved context to answer the question
+            model: Model to use (defaults to self.model)
+            **kwargs: Additional parameters for chat
+
+        Returns:
+            Generated response text
+        """
+        messages = self._context_messages(question, context)
         return self.chat(messages, model=model, **kwargs)
+
+    def stream_chat_with_context(self, question: str, context: str, model: Optional[str] = None, **kwargs) -> Iterator[str]:
+        """Stream a chat response using context (RAG pattern).
+
+        Args:
+            question: The user's question
+            context: Retrieved context to answer the question
+            model: Model to use (defaults to self.model)
+            **kwargs: Additional parameters for chat
+
+        Yields:
+            Chunks of generated text
+        """
+        messages = self._context_messages(question, context)
+        return self.stream_chat(messages, model=model, **kwargs)
@@ -1,13 +1,16 @@
 """RAG Pipeline for Wikipedia-based question answering."""
 
 import asyncio
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, Iterator, List, Optional, Tuple
 from dataclasses import dataclass
 
 from mcp_client import WikipediaMCPClient
 from ollama_client import OllamaClient
 
 
+NO_ARTICLES_ANSWER = "I couldn't find any relevant information in Wikipedia to answer your question."
+
+
 @dataclass
 class RAGResult:
     """Result from RAG pipeline."""
@@ -169,7 +172,7 @@ class RAGPipeline:
 
         if not articles:
             return RAGResult(
-                answer="I couldn't find any relevant information in Wikipedia to answer your question.",
+                answer=NO_ARTICLES_ANSWER,
                 sources=[],
                 context_used="",
                 query=query
@@ -187,3 +190,24 @@ class RAGPipeline:
             context_used=context,
             query=query
         )
+
+    async def stream_answer_question(self, query: str) -> Tuple[Iterator[str], List[Dict[str, str]]]:
+        """Answer a question, streaming the generated answer.
+
+        Retrieval and context preparation happen up front; the returned
+        iterator yields answer chunks from Ollama as they are generated.
+
+        Args:
+            query: User's question
+
+        Returns:
+            Tuple of (answer_chunks, sources)
+        """
+        articles = await self.retrieve_articles(query)
+
+        if not articles:
+            return iter([NO_ARTICLES_ANSWER]), []
+
+        context, sources = self.prepare_context(articles)
+        chunks = self.ollama_client.stream_chat_with_context(query, context)
+        return chunks, sources
@@ -0,0 +1,143 @@
+"""Embedding-based answer cache for paraphrased questions."""
+
+import threading
+import time
+from typing import Any, List, Optional, Tuple
+
+
+class SemanticCache:
+    """Cache answers by question embedding similarity.
+
+    Questions are embedded with a small sentence-transformers model and
+    compared by cosine similarity against previously answered questions.
+    sentence-transformers is an optional dependency: when it is not
+    installed the cache is inert and every lookup misses.
+    """
+
+    def __init__(
+        self,
+        model_name: str = "all-MiniLM-L6-v2",
+        threshold: float = 0.95,
+        max_entries: int = 1024
+    ):
+        """Initialize the semantic cache.
+
+        Args:
+            model_name: sentence-transformers model used for embeddings
+            threshold: Minimum cosine similarity for a cache hit
+            max_entries: Maximum number of cached answers (oldest evicted first)
+        """
+        self.model_name = model_name
+        self.threshold = threshold
+        self.max_entries = max_entries
+
+        self._model = None
+        self._available: Optional[bool] = None
+        self._lock = threading.Lock()
+
+        # Ring buffer of normalized embeddings, insert times and the
+        # matching answers
+        self._embeddings = None
+        self._timestamps = None
+        self._answers: List[Any] = []
+        self._next = 0
+
+    def _load_model(self) -> bool:
+        """Load the embedding model on first use.
+
+        Returns:
+            True if the model is available
+        """
+        with self._lock:
+            if self._available is None:
+                try:
+                    from sentence_transformers import SentenceTransformer
+                    self._model = SentenceTransformer(
+                        self.model_name, device="cpu")
+                    self._available = True
+                except Exception:
+                    self._available = False
+            return self._available
+
+    def embed(self, question: str):
+        """Embed a question.
+
+        Args:
+            question: The question to embed
+
+        Returns:
+            Normalized float32 embedding, or None if embeddings are unavailable
+        """
+        if not self._load_model():
+            return None
+        return self._model.encode(
+            [question.strip()],
+            normalize_embeddings=True,
+            convert_to_numpy=True
+        )[0].astype("float32")
+
+    def lookup(
+        self,
+        vector,
+        max_age: Optional[float] = None
+    ) -> Optional[Tuple[float, Any]]:
+        """Find the answer to the most similar cached question.
+
+        Args:
+            vector: Embedding returned by embed()
+            max_age: Ignore entries stored more than this many seconds ago
+
+        Returns:
+            Tuple of (timestamp, answer) for the best entry whose similarity
+            reaches the threshold, else None. The timestamp is the
+            time.monotonic() value the entry was stored with.
+        """
+        if vector is None:
+            return None
+
+        import numpy as np
+
+        with self._lock:
+            count = len(self._answers)
+            if not count:
+                return None
+            sims = self._embeddings[:count] @ vector
+            if max_age is not None:
+                stale = time.monotonic() - self._timestamps[:count] >= max_age
+                sims[stale] = -np.inf
+            idx = int(sims.argmax())
+            if sims[idx] >= self.threshold:
+                return float(self._timestamps[idx]), self._answers[idx]
+            return None
+
+    def add(self, vector, answer: Any, timestamp: Optional[float] = None):
+        """Store an answer under a question embedding.
+
+        Args:
+            vector: Embedding returned by embed()
+            answer: Answer to cache
+            timestamp: time.monotonic() value to store the entry with
+                (defaults to now)
+        """
+        if vector is None:
+            return
+
+        import numpy as np
+
+        if timestamp is None:
+            timestamp = time.monotonic()
+
+        with self._lock:
+            if self._embeddings is None:
+                self._embeddings = np.zeros(
+                    (self.max_entries, vector.shape[0]), dtype=np.float32)
+                self._timestamps = np.zeros(
+                    self.max_entries, dtype=np.float64)
+
+            self._embeddings[self._next] = vector
+            self._timestamps[self._next] = timestamp
+            if len(self._answers) < self.max_entries:
+                self._answers.append(answer)
+            else:
+                self._answers[self._next] = answer
+            self._next = (self._next + 1) % self.max_entries
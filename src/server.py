@@ -3,18 +3,23 @@
 import asyncio
 import time
 from contextlib import asynccontextmanager
-from typing import Optional
+from typing import Any, Dict, Optional, Type, TypeVar
 
-from fastapi import FastAPI, HTTPException, status
+import msgspec
+from fastapi import FastAPI, HTTPException, Request, status
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.openapi.utils import get_openapi
+from fastapi.responses import JSONResponse, StreamingResponse
 
 from api_models import (
     QuestionRequest,
     AnswerResponse,
     HealthResponse,
     ErrorResponse,
-    Source
+    Source,
+    openapi_schemas,
+    schema_ref
 )
 from rag_pipeline import RAGPipeline
 from ollama_client import OllamaClient
@@ -24,6 +29,56 @@ from config import config
 # Global pipeline instance
 pipeline: Optional[RAGPipeline] = None
 
+T = TypeVar("T")
+
+# Streaming endpoints must not be compressed: the gzip encoder buffers small
+# chunks, which would hold back tokens until enough output has accumulated
+UNCOMPRESSED_PATHS = {"/api/v1/ask/stream"}
+
+
+class MsgspecResponse(JSONResponse):
+    """JSON response serialized with msgspec."""
+
+    def render(self, content: Any) -> bytes:
+        return msgspec.json.encode(content)
+
+
+async def decode_body(request: Request, model: Type[T]) -> T:
+    """Decode and validate a JSON request body with msgspec.
+
+    Args:
+        request: Incoming request
+        model: msgspec.Struct type to decode into
+
+    Returns:
+        Decoded model instance
+
+    Raises:
+        HTTPException: 422 if the body is not valid JSON for the model
+    """
+    try:
+        return msgspec.json.decode(await request.body(), type=model)
+    except msgspec.DecodeError as e:
+        raise HTTPException(
+            status_code=422,
+            detail=str(e)
+        )
+
+
+class SelectiveGZipMiddleware(GZipMiddleware):
+    """GZip middleware that leaves streaming endpoints uncompressed."""
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http" and scope["path"] in UNCOMPRESSED_PATHS:
+            await self.app(scope, receive, send)
+            return
+        await super().__call__(scope, receive, send)
+
+
+def json_content(model: type) -> Dict[str, Any]:
+    """OpenAPI content entry for a JSON body of the given model."""
+    return {"application/json": {"schema": schema_ref(model)}}
+
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
@@ -57,6 +112,24 @@ app = FastAPI(
     lifespan=lifespan
 )
 
+
+def custom_openapi() -> Dict[str, Any]:
+    """Build the OpenAPI schema, including the msgspec model schemas."""
+    if app.openapi_schema is None:
+        schema = get_openapi(
+            title=app.title,
+            version=app.version,
+            description=app.description,
+            routes=app.routes
+        )
+        schema.setdefault("components", {}).setdefault(
+            "schemas", {}).update(openapi_schemas())
+        app.openapi_schema = schema
+    return app.openapi_schema
+
+
+app.openapi = custom_openapi
+
 # Add CORS middleware
 app.add_middleware(
     CORSMiddleware,
@@ -66,6 +139,10 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Compress answers (plain text, typically several KB) for clients that
+# advertise gzip support
+app.add_middleware(SelectiveGZipMiddleware, minimum_size=1000)
+
 
 @app.get("/", tags=["Root"])
 async def root():
@@ -78,7 +155,12 @@ async def root():
     }
 
 
-@app.get("/health", response_model=HealthResponse, tags=["Health"])
+@app.get(
+    "/health",
+    response_class=MsgspecResponse,
+    responses={200: {"content": json_content(HealthResponse)}},
+    tags=["Health"]
+)
 async def health_check():
     """Health check endpoint.
 
@@ -97,27 +179,31 @@ async def health_check():
     except Exception as e:
         message = f"Ollama not accessible: {str(e)}"
 
-    return HealthResponse(
+    return MsgspecResponse(HealthResponse(
         status="healthy" if ollama_accessible else "degraded",
         ollama_accessible=ollama_accessible,
         message=message
-    )
+    ))
 
 
 @app.post(
     "/api/v1/ask",
-    response_model=AnswerResponse,
+    response_class=MsgspecResponse,
     responses={
-        500: {"model": ErrorResponse},
-        400: {"model": ErrorResponse}
+        200: {"content": json_content(AnswerResponse)},
+        500: {"description": "Internal Server Error", "content": json_content(ErrorResponse)},
+        400: {"description": "Bad Request", "content": json_content(ErrorResponse)}
+    },
+    openapi_extra={
+        "requestBody": {"required": True, "content": json_content(QuestionRequest)}
     },
     tags=["Question Answering"]
 )
-async def ask_question(request: QuestionRequest):
+async def ask_question(http_request: Request):
     """Answer a question using the RAG pipeline.
 
     Args:
-        request: Question request containing the question to answer
+        http_request: HTTP request whose body is a QuestionRequest
 
     Returns:
         Answer response with the generated answer and sources
@@ -125,6 +211,8 @@ async def ask_question(request: QuestionRequest):
     Raises:
         HTTPException: If the pipeline is not initialized or an error occurs
     """
+    request = await decode_body(http_request, QuestionRequest)
+
     if pipeline is None:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -151,18 +239,83 @@ async def ask_question(request: QuestionRequest):
             for source in result.sources
         ]
 
-        return AnswerResponse(
+        return MsgspecResponse(AnswerResponse(
             answer=result.answer,
             sources=sources,
             processing_time=processing_time
+        ))
+
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error processing question: {str(e)}"
         )
 
+
+@app.post(
+    "/api/v1/ask/stream",
+    response_class=StreamingResponse,
+    responses={
+        200: {"content": {"application/x-ndjson": {}}},
+        500: {"description": "Internal Server Error", "content": json_content(ErrorResponse)},
+        400: {"description": "Bad Request", "content": json_content(ErrorResponse)}
+    },
+    openapi_extra={
+        "requestBody": {"required": True, "content": json_content(QuestionRequest)}
+    },
+    tags=["Question Answering"]
+)
+async def ask_question_stream(http_request: Request):
+    """Answer a question, streaming the answer as newline-delimited JSON.
+
+    Each line is a JSON object: {"token": ...} for every chunk of the answer,
+    then a final {"sources": [...], "processing_time": ...} frame. Errors
+    after the stream has started are reported as an {"error": ...} frame.
+
+    Args:
+        http_request: HTTP request whose body is a QuestionRequest
+
+    Returns:
+        Streaming NDJSON response
+
+    Raises:
+        HTTPException: If the pipeline is not initialized or retrieval fails
+    """
+    request = await decode_body(http_request, QuestionRequest)
+
+    if pipeline is None:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="RAG pipeline not initialized"
+        )
+
+    start_time = time.time()
+
+    try:
+        chunks, sources = await pipeline.stream_answer_question(request.question)
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Error processing question: {str(e)}"
         )
 
+    def frames():
+        # Ollama streams synchronously; StreamingResponse iterates this
+        # generator in a worker thread
+        try:
+            for chunk in chunks:
+                yield msgspec.json.encode({"token": chunk}) + b"\n"
+        except Exception as e:
+            yield msgspec.json.encode({"error": f"Error generating answer: {str(e)}"}) + b"\n"
+            return
+
+        yield msgspec.json.encode({
+            "sources": sources,
+            "processing_time": time.time() - start_time
+        }) + b"\n"
+
+    return StreamingResponse(frames(), media_type="application/x-ndjson")
+
 
 if __name__ == "__main__":
     import uvicorn